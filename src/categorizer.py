@@ -4,14 +4,135 @@ Automatically classifies articles into categories using rules and AI
 """
 
 import anthropic
+import asyncio
+import functools
+import hashlib
 import os
+import re
 import yaml
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
+from types import MappingProxyType
 import logging
 
+from defaults import BODY_EXCERPT_LENGTH, DEFAULT_CONCURRENCY
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover - optional prompt prefilter
+    np = None
+    SentenceTransformer = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of categorize() results memoized per instance
+CATEGORIZE_CACHE_SIZE = 4096
+
+# Claude model and number of articles per bulk categorization prompt
+AI_MODEL = "claude-sonnet-4-20250514"
+AI_BATCH_SIZE = 5
+
+# One "index: category/subcategory" line of a bulk categorization response
+_BULK_LINE_RE = re.compile(r'^\s*(\d+)\s*[:：.]\s*(\S+)\s*$', re.MULTILINE)
+
+# Number of candidate subcategories offered to Claude when prefiltering
+PREFILTER_TOP_K = 8
+
+
+def _freeze(value):
+    """
+    Return a read-only copy of parsed YAML data
+
+    Dicts become MappingProxyType views of frozen copies and lists become
+    tuples, recursively; other values are returned unchanged.
+
+    Args:
+        value: Parsed YAML value
+
+    Returns:
+        Immutable equivalent of value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=8)
+def _load_categories(path: str, mtime: float) -> Tuple:
+    """
+    Parse a categories file and build its lookup tables
+
+    Cached per (path, mtime) so instances share one parse until the file
+    changes. Everything returned is read-only (mappings are wrapped in
+    MappingProxyType), so no instance can change what the others see.
+
+    Args:
+        path: Path to categories definition file
+        mtime: Modification time of the file (cache key only)
+
+    Returns:
+        (categories, compiled, tag_index, keyword_index, category_lines,
+        subcat_texts) tuple
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        categories = yaml.load(f, Loader=SafeLoader)['categories']
+
+    # Freeze each subcategory once: lowercased tags/keywords as
+    # immutable sets/tuples so hot-path lookups never touch the YAML dicts
+    compiled: Dict[str, Dict[str, Dict]] = {
+        cat_key: {
+            subcat_key: {
+                'tags': frozenset(map(str.lower, subcat_data.get('tags', []))),
+                'kws': tuple(k.lower() for k in subcat_data.get('keywords', [])),
+                'name': subcat_data['name']
+            }
+            for subcat_key, subcat_data in cat_data['subcategories'].items()
+        }
+        for cat_key, cat_data in categories.items()
+    }
+
+    # Precompute lookup tables for rule-based matching.
+    # Tag hits carry the subcategory's definition order so that the
+    # first subcategory in the YAML still wins, as with the nested scan.
+    tag_index: Dict[str, Tuple[int, str, str]] = {}
+    keyword_index: List[Tuple[str, str, str]] = []
+    category_lines: List[str] = []
+    subcat_texts: List[str] = []
+    rank = 0
+    for cat_key, subcats in compiled.items():
+        description = categories[cat_key].get('description', '')
+        for subcat_key, entry in subcats.items():
+            for tag in entry['tags']:
+                tag_index.setdefault(tag, (rank, cat_key, subcat_key))
+            for keyword in entry['kws']:
+                keyword_index.append((keyword, cat_key, subcat_key))
+            category_lines.append(f"{cat_key}/{subcat_key} - {entry['name']}")
+            subcat_texts.append(' '.join([entry['name'], description, *entry['kws']]))
+            rank += 1
+
+    return (
+        _freeze(categories),
+        _freeze(compiled),
+        MappingProxyType(tag_index),
+        tuple(keyword_index),
+        tuple(category_lines),
+        tuple(subcat_texts)
+    )
+
 
 class ArticleCategorizer:
     """Categorizes articles using rule-based and AI-powered methods"""
@@ -19,7 +140,10 @@ class ArticleCategorizer:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        categories_path: str = "config/categories.yaml"
+        categories_path: str = "config/categories.yaml",
+        embedding_model: Optional[str] = None,
+        top_k: int = PREFILTER_TOP_K,
+        db=None
     ):
         """
         Initialize categorizer
@@ -27,18 +151,69 @@ class ArticleCategorizer:
         Args:
             api_key: Anthropic API key (if None, reads from env)
             categories_path: Path to categories definition file
+            embedding_model: sentence-transformers model used to prefilter
+                the categories offered to Claude (None disables prefiltering)
+            top_k: Number of candidate subcategories per article
+            db: ArticleDatabase used to persist AI verdicts across runs
+                (None keeps them in memory only)
         """
-        # Load categories
-        with open(categories_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            self.categories = config['categories']
+        # Load categories (parsed once per file version, shared by instances)
+        (
+            self.categories,
+            self._compiled,
+            self._tag_index,
+            self._keyword_index,
+            self._category_lines,
+            subcat_texts
+        ) = _load_categories(categories_path, os.path.getmtime(categories_path))
+
+        # Category list fragment for the AI prompt (constant per instance)
+        self._ai_category_list_str = '\n'.join(self._category_lines)
+
+        # Optional embedding index used to shrink the AI prompt to top-K
+        # plausible subcategories
+        self.top_k = top_k
+        self._embedder = None
+        self._subcat_emb = None
+        # e5 models are trained with "query: "/"passage: " prefixes; other
+        # models would just see them as noise
+        is_e5 = bool(embedding_model) and 'e5' in embedding_model.lower()
+        self._query_prefix = "query: " if is_e5 else ""
+        self._passage_prefix = "passage: " if is_e5 else ""
+        if embedding_model:
+            if SentenceTransformer is None:
+                logger.warning(
+                    "sentence-transformers not installed - category prefilter disabled"
+                )
+            else:
+                self._embedder = SentenceTransformer(embedding_model)
+                self._subcat_emb = self._embedder.encode(
+                    [self._passage_prefix + text for text in subcat_texts],
+                    normalize_embeddings=True
+                )
+
+        # Single-pass keyword matcher over all subcategories (optional),
+        # with one compiled alternation per subcategory as the fallback
+        self._kw_automaton = self._build_keyword_automaton()
+        self._kw_regex: List[Tuple[re.Pattern, str, str]] = []
+        if self._kw_automaton is None:
+            self._kw_regex = self._build_keyword_regex()
+
+        # LRU memo of categorize() results keyed by normalized input
+        self._cache: OrderedDict = OrderedDict()
 
-        # Initialize Claude client for fallback AI classification
+        # Persistent AI verdict cache (optional)
+        self.db = db
+
+        # Initialize Claude clients for fallback AI classification
+        # (async for batch processing, sync for one-off categorize() calls)
         api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         if api_key:
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = anthropic.AsyncAnthropic(api_key=api_key)
+            self.sync_client = anthropic.Anthropic(api_key=api_key)
         else:
             self.client = None
+            self.sync_client = None
             logger.warning("No Anthropic API key found - AI categorization disabled")
 
         logger.info(f"Loaded {len(self.categories)} main categories")
@@ -47,7 +222,7 @@ class ArticleCategorizer:
         self,
         title: str,
         tags: List[str],
-        body: str = ""
+        body_excerpt: str = ""
     ) -> Tuple[str, str]:
         """
         Categorize an article
@@ -55,24 +230,219 @@ class ArticleCategorizer:
         Args:
             title: Article title
             tags: List of tags
-            body: Article content (optional)
+            body_excerpt: Start of the article content (optional); only
+                the first BODY_EXCERPT_LENGTH characters are used
 
         Returns:
             (category, subcategory) tuple
         """
+        body = body_excerpt[:BODY_EXCERPT_LENGTH]
+        key = self._cache_key(title, tags, body)
+        cached = self._cache_get(key, title)
+        if cached is not None:
+            return cached
+
         # First try rule-based categorization
         category, subcategory = self._rule_based_categorize(title, tags)
 
         # If rule-based fails and we have body content, try AI
-        if category == "other" and self.client and body:
+        if category == "other" and self.sync_client and body:
             try:
                 category, subcategory = self._ai_categorize(title, tags, body)
             except Exception as e:
                 logger.error(f"AI categorization failed: {e}")
 
+        return self._cache_put(key, title, category, subcategory)
+
+    async def categorize_batch(
+        self,
+        articles: List[Dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        batch_size: int = AI_BATCH_SIZE
+    ) -> List[Tuple[str, str]]:
+        """
+        Categorize multiple articles
+
+        Rule-based matching runs first; articles it cannot place are sent
+        to Claude in groups of batch_size per prompt.
+
+        Args:
+            articles: List of article dictionaries (title, tags and
+                body_excerpt, falling back to body)
+            concurrency: Maximum number of in-flight AI requests
+            batch_size: Number of articles classified per AI request
+
+        Returns:
+            List of (category, subcategory) tuples in input order
+        """
+        results: List[Optional[Tuple[str, str]]] = [None] * len(articles)
+        pending = []
+
+        for i, article in enumerate(articles):
+            title = article['title']
+            tags = article['tags']
+            body = article.get('body_excerpt')
+            if body is None:
+                body = article.get('body', '')
+            body = body[:BODY_EXCERPT_LENGTH]
+
+            key = self._cache_key(title, tags, body)
+            cached = self._cache_get(key, title)
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            category, subcategory = self._rule_based_categorize(title, tags)
+            if category == "other" and self.client and body:
+                pending.append((i, key, title, tags, body))
+            else:
+                results[i] = self._cache_put(key, title, category, subcategory)
+
+        # Reuse AI verdicts stored by earlier runs
+        digests = [self._ai_cache_key(title, tags) for _, _, title, tags, _ in pending]
+        stored = self._stored_verdicts(digests)
+        remaining = []
+        for item, digest in zip(pending, digests):
+            if digest in stored:
+                i, key, title, _, _ = item
+                results[i] = self._cache_put(key, title, *stored[digest])
+            else:
+                remaining.append((item, digest))
+        pending = [item for item, _ in remaining]
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded(chunk: list) -> List[Tuple[str, str]]:
+            async with sem:
+                try:
+                    return await self._ai_categorize_bulk(
+                        [(title, tags, body) for _, _, title, tags, body in chunk]
+                    )
+                except Exception as e:
+                    logger.error(f"AI categorization failed: {e}")
+                    return [("other", "general")] * len(chunk)
+
+        chunks = [
+            pending[j:j + batch_size]
+            for j in range(0, len(pending), batch_size)
+        ]
+        verdicts = await asyncio.gather(*[bounded(c) for c in chunks])
+
+        for chunk, chunk_verdicts in zip(chunks, verdicts):
+            for (i, key, title, _, _), (category, subcategory) in zip(chunk, chunk_verdicts):
+                results[i] = self._cache_put(key, title, category, subcategory)
+
+        flat_verdicts = [verdict for chunk_verdicts in verdicts for verdict in chunk_verdicts]
+        self._store_verdicts([
+            (digest, category, subcategory)
+            for (_, digest), (category, subcategory) in zip(remaining, flat_verdicts)
+        ])
+
+        return results
+
+    def _cache_get(
+        self,
+        key: Tuple[str, Tuple[str, ...], str],
+        title: str
+    ) -> Optional[Tuple[str, str]]:
+        """Return a memoized result and mark it as recently used"""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            logger.debug(f"Category cache hit: {cached[0]}/{cached[1]} - {title}")
+        return cached
+
+    def _cache_put(
+        self,
+        key: Tuple[str, Tuple[str, ...], str],
+        title: str,
+        category: str,
+        subcategory: str
+    ) -> Tuple[str, str]:
+        """Memoize a result, evicting the least recently used entry"""
         logger.info(f"Categorized as: {category}/{subcategory} - {title}")
+
+        self._cache[key] = (category, subcategory)
+        if len(self._cache) > CATEGORIZE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
         return category, subcategory
 
+    @staticmethod
+    def _cache_key(
+        title: str,
+        tags: List[str],
+        body: str
+    ) -> Tuple[str, Tuple[str, ...], str]:
+        """
+        Build memoization key for categorize()
+
+        Args:
+            title: Article title
+            tags: List of tags
+            body: Article content excerpt
+
+        Returns:
+            (title, sorted lowercased tags, body digest) tuple
+        """
+        tags_key = tuple(sorted(tag.lower() for tag in tags))
+        body_hash = hashlib.blake2b(
+            body.encode('utf-8'), digest_size=8
+        ).hexdigest()
+        return title, tags_key, body_hash
+
+    @staticmethod
+    def _ai_cache_key(title: str, tags: List[str]) -> bytes:
+        """
+        Build the persistent AI cache key for an article
+
+        Args:
+            title: Article title
+            tags: List of tags
+
+        Returns:
+            16-byte digest of the title and sorted tags
+        """
+        text = f"{title}|{','.join(sorted(tags))}"
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _stored_verdicts(self, digests: List[bytes]) -> Dict[bytes, Tuple[str, str]]:
+        """
+        Look up AI verdicts persisted by earlier runs
+
+        Args:
+            digests: AI cache keys
+
+        Returns:
+            Dictionary mapping digest to (category, subcategory) for
+            verdicts that are still valid categories
+        """
+        if self.db is None or not digests:
+            return {}
+
+        return {
+            digest: (category, subcategory)
+            for digest, (category, subcategory) in self.db.get_ai_categories(digests).items()
+            if subcategory in self._compiled.get(category, ())
+        }
+
+    def _store_verdicts(self, rows: List[Tuple[bytes, str, str]]):
+        """
+        Persist AI verdicts
+
+        "other" results are not stored since they also stand for failed
+        requests and should be retried on the next run.
+
+        Args:
+            rows: List of (digest, category, subcategory) tuples
+        """
+        if self.db is None:
+            return
+
+        rows = [row for row in rows if row[1] != "other"]
+        if rows:
+            self.db.add_ai_categories(rows)
+
     def _rule_based_categorize(
         self,
         title: str,
@@ -88,29 +458,76 @@ class ArticleCategorizer:
         Returns:
             (category, subcategory) tuple
         """
-        title_lower = title.lower()
-        tags_lower = [tag.lower() for tag in tags]
-
         # Try to match by tags first (most reliable)
-        for cat_key, cat_data in self.categories.items():
-            for subcat_key, subcat_data in cat_data['subcategories'].items():
-                # Check tags
-                subcat_tags_lower = [t.lower() for t in subcat_data.get('tags', [])]
-                for tag in tags_lower:
-                    if tag in subcat_tags_lower:
-                        return cat_key, subcat_key
+        best = None
+        for tag in tags:
+            hit = self._tag_index.get(tag.lower())
+            if hit and (best is None or hit < best):
+                best = hit
+        if best:
+            return best[1], best[2]
 
         # Try to match by keywords in title
-        for cat_key, cat_data in self.categories.items():
-            for subcat_key, subcat_data in cat_data['subcategories'].items():
-                # Check keywords
-                for keyword in subcat_data.get('keywords', []):
-                    if keyword.lower() in title_lower:
-                        return cat_key, subcat_key
+        title_lower = title.lower()
+        if self._kw_automaton is not None:
+            best = None
+            for _, hit in self._kw_automaton.iter(title_lower):
+                if best is None or hit < best:
+                    best = hit
+            if best:
+                return best[1], best[2]
+        else:
+            for pattern, cat_key, subcat_key in self._kw_regex:
+                if pattern.search(title_lower):
+                    return cat_key, subcat_key
 
         # No match found
         return "other", "general"
 
+    def _build_keyword_automaton(self):
+        """
+        Build an Aho-Corasick automaton over all lowercased keywords
+
+        Returns:
+            Automaton mapping keyword -> (rank, category, subcategory),
+            or None if pyahocorasick is unavailable
+        """
+        if ahocorasick is None or not self._keyword_index:
+            return None
+
+        ranks = {}
+        for cat_key, subcats in self._compiled.items():
+            for subcat_key in subcats:
+                ranks[(cat_key, subcat_key)] = len(ranks)
+
+        automaton = ahocorasick.Automaton()
+        for keyword, cat_key, subcat_key in self._keyword_index:
+            # Keep the first subcategory that defines a shared keyword
+            if not automaton.exists(keyword):
+                automaton.add_word(
+                    keyword, (ranks[(cat_key, subcat_key)], cat_key, subcat_key)
+                )
+        automaton.make_automaton()
+        return automaton
+
+    def _build_keyword_regex(self) -> List[Tuple[re.Pattern, str, str]]:
+        """
+        Compile one keyword alternation per subcategory
+
+        Patterns are kept in definition order so the first matching
+        subcategory still wins.
+
+        Returns:
+            List of (pattern, category, subcategory) tuples
+        """
+        patterns = []
+        for cat_key, subcats in self._compiled.items():
+            for subcat_key, compiled in subcats.items():
+                if compiled['kws']:
+                    pattern = re.compile('|'.join(map(re.escape, compiled['kws'])))
+                    patterns.append((pattern, cat_key, subcat_key))
+        return patterns
+
     def _ai_categorize(
         self,
         title: str,
@@ -128,25 +545,108 @@ class ArticleCategorizer:
         Returns:
             (category, subcategory) tuple
         """
-        if not self.client:
+        digest = self._ai_cache_key(title, tags)
+        stored = self._stored_verdicts([digest])
+        if digest in stored:
+            return stored[digest]
+
+        if not self.sync_client:
             return "other", "general"
 
-        # Build category list for prompt
-        category_list = []
-        for cat_key, cat_data in self.categories.items():
-            for subcat_key, subcat_data in cat_data['subcategories'].items():
-                category_list.append(
-                    f"{cat_key}/{subcat_key} - {subcat_data['name']}"
-                )
+        try:
+            message = self.sync_client.messages.create(
+                **self._ai_request(title, tags, body)
+            )
+            category, subcategory = self._parse_ai_result(message.content[0].text)
+            self._store_verdicts([(digest, category, subcategory)])
+            return category, subcategory
+
+        except Exception as e:
+            logger.error(f"Error in AI categorization: {e}")
+
+        return "other", "general"
+
+    async def _ai_categorize_bulk(
+        self,
+        items: List[Tuple[str, List[str], str]]
+    ) -> List[Tuple[str, str]]:
+        """
+        Categorize several articles with a single Claude request
+
+        Args:
+            items: List of (title, tags, body) tuples
 
+        Returns:
+            List of (category, subcategory) tuples aligned with items
+        """
+        fallback = [("other", "general")] * len(items)
+        if not self.client or not items:
+            return fallback
+
+        numbered = []
+        for n, (title, tags, body) in enumerate(items, 1):
+            numbered.append(
+                f"{n}. タイトル: {title}\n"
+                f"   タグ: {', '.join(tags)}\n"
+                f"   内容の抜粋: {body[:400]}"
+            )
+
+        prompt = f"""以下の技術記事{len(items)}件をそれぞれ最も適切なカテゴリに分類してください。
+
+{chr(10).join(numbered)}
+
+利用可能なカテゴリ:
+{self._candidate_category_list([f"{t} {' '.join(tg)}" for t, tg, _ in items])}
+
+応答は必ず各行に以下の形式でお願いします（他の説明は不要）:
+番号: category/subcategory
+
+例:
+1: frontend/react
+2: backend/python
+
+応答:"""
+
+        try:
+            message = await self.client.messages.create(
+                model=AI_MODEL,
+                max_tokens=30 * len(items),
+                temperature=0.0,
+                messages=[{"role": "user", "content": prompt}]
+            )
+
+            results = list(fallback)
+            for match in _BULK_LINE_RE.finditer(message.content[0].text):
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(items):
+                    results[index] = self._parse_ai_result(match.group(2))
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in bulk AI categorization: {e}")
+
+        return fallback
+
+    def _ai_request(self, title: str, tags: List[str], body: str) -> Dict:
+        """
+        Build Claude request parameters for categorization
+
+        Args:
+            title: Article title
+            tags: List of tags
+            body: Article body
+
+        Returns:
+            Keyword arguments for messages.create
+        """
         prompt = f"""以下の技術記事を最も適切なカテゴリに分類してください。
 
 タイトル: {title}
 タグ: {', '.join(tags)}
-内容の抜粋: {body[:1000]}
+内容の抜粋: {body}
 
 利用可能なカテゴリ:
-{chr(10).join(category_list)}
+{self._candidate_category_list([f"{title} {' '.join(tags)}"])}
 
 応答は必ず以下の形式でお願いします（他の説明は不要）:
 category/subcategory
@@ -155,29 +655,60 @@ category/subcategory
 
 応答:"""
 
-        try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=50,
-                temperature=0.0,
-                messages=[{"role": "user", "content": prompt}]
-            )
+        return {
+            'model': AI_MODEL,
+            'max_tokens': 50,
+            'temperature': 0.0,
+            'messages': [{"role": "user", "content": prompt}]
+        }
 
-            result = message.content[0].text.strip()
+    def _candidate_category_list(self, queries: List[str]) -> str:
+        """
+        Build the category list offered to Claude
 
-            # Parse result
-            if '/' in result:
-                parts = result.split('/')
-                category = parts[0].strip()
-                subcategory = parts[1].strip()
+        With an embedding model configured, only the top_k subcategories
+        closest to each query are listed; otherwise all are.
 
-                # Validate result
-                if category in self.categories:
-                    if subcategory in self.categories[category]['subcategories']:
-                        return category, subcategory
+        Args:
+            queries: One "title tags" string per article in the prompt
 
-        except Exception as e:
-            logger.error(f"Error in AI categorization: {e}")
+        Returns:
+            Newline-separated "category/subcategory - name" lines
+        """
+        if self._embedder is None or self.top_k >= len(self._category_lines):
+            return self._ai_category_list_str
+
+        query_emb = self._embedder.encode(
+            [self._query_prefix + q for q in queries],
+            normalize_embeddings=True
+        )
+        scores = query_emb @ self._subcat_emb.T
+
+        top = np.argpartition(-scores, self.top_k - 1, axis=1)[:, :self.top_k]
+        selected = sorted(set(top.ravel().tolist()))
+        return '\n'.join(self._category_lines[i] for i in selected)
+
+    def _parse_ai_result(self, text: str) -> Tuple[str, str]:
+        """
+        Parse and validate a "category/subcategory" response
+
+        Args:
+            text: Raw response text
+
+        Returns:
+            (category, subcategory) tuple
+        """
+        result = text.strip()
+
+        # Parse result
+        if '/' in result:
+            parts = result.split('/')
+            category = parts[0].strip()
+            subcategory = parts[1].strip()
+
+            # Validate result
+            if subcategory in self._compiled.get(category, ()):
+                return category, subcategory
 
         return "other", "general"
 
@@ -219,7 +750,7 @@ category/subcategory
         Returns:
             Dictionary mapping category to list of subcategories
         """
-        result = {}
-        for cat_key, cat_data in self.categories.items():
-            result[cat_key] = list(cat_data['subcategories'].keys())
-        return result
+        return {
+            cat_key: list(subcats)
+            for cat_key, subcats in self._compiled.items()
+        }
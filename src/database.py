@@ -5,13 +5,40 @@ Handles duplicate detection and article tracking
 
 import sqlite3
 import json
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Re-seen articles are updated in place (stable id, no delete + reinsert).
+# The original category is kept so category_stats stay consistent.
+INSERT_ARTICLE_SQL = """
+    INSERT INTO articles (
+        source, article_id, url, title, author, author_name,
+        published_at, category, subcategory, file_path,
+        tags, likes_count, stocks_count, is_summarized
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source, article_id) DO UPDATE SET
+        title = excluded.title,
+        tags = excluded.tags,
+        likes_count = excluded.likes_count,
+        stocks_count = excluded.stocks_count,
+        file_path = excluded.file_path,
+        is_summarized = excluded.is_summarized
+"""
+
+# Answered from the UNIQUE(source, article_id) index alone (covering).
+# Reusing one SQL string lets sqlite3's statement cache skip re-preparing.
+ARTICLE_EXISTS_SQL = "SELECT 1 FROM articles WHERE source = ? AND article_id = ? LIMIT 1"
+
+# Maximum number of bound keys per ai_cache lookup (SQLite variable limit)
+AI_CACHE_LOOKUP_CHUNK = 500
+
 
 class ArticleDatabase:
     """SQLite database for article tracking and duplicate detection"""
@@ -27,13 +54,24 @@ class ArticleDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.conn = None
+        self._transaction_depth = 0
+        # Serializes writes on the shared connection across threads
+        self._lock = threading.RLock()
         self.connect()
         self.init_db()
 
     def connect(self):
         """Create database connection"""
-        self.conn = sqlite3.connect(str(self.db_path))
+        # Shared by worker threads; writes are serialized with self._lock
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+
+        # WAL + relaxed sync: one fsync per checkpoint instead of per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
         logger.info(f"Connected to database: {self.db_path}")
 
     def init_db(self):
@@ -82,6 +120,16 @@ class ArticleDatabase:
             )
         """)
 
+        # AI categorization verdicts keyed by a digest of title + tags
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                h BLOB PRIMARY KEY,
+                cat TEXT NOT NULL,
+                subcat TEXT NOT NULL,
+                ts DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Indexes
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_published_at
@@ -101,6 +149,34 @@ class ArticleDatabase:
         self.conn.commit()
         logger.info("Database schema initialized")
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into a single transaction
+
+        Writes made inside the block are committed once on exit, or rolled
+        back if the block raises. Nested blocks join the outer transaction.
+        Writes from other threads wait until the transaction ends.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.conn.rollback()
+                raise
+            else:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.conn.commit()
+
+    def _commit(self):
+        """Commit unless an explicit transaction is open"""
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
     def article_exists(self, source: str, article_id: str) -> bool:
         """
         Check if article already exists in database
@@ -112,12 +188,45 @@ class ArticleDatabase:
         Returns:
             True if article exists
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT 1 FROM articles WHERE source = ? AND article_id = ? LIMIT 1",
-            (source, article_id)
-        )
-        return cursor.fetchone() is not None
+        row = self.conn.execute(ARTICLE_EXISTS_SQL, (source, article_id)).fetchone()
+        return row is not None
+
+    def filter_new(self, keys: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        Find which articles are not yet in the database
+
+        Args:
+            keys: List of (source, article_id) tuples
+
+        Returns:
+            Set of (source, article_id) tuples not present in the database
+        """
+        if not keys:
+            return set()
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS candidate_keys (
+                    source TEXT NOT NULL,
+                    article_id TEXT NOT NULL
+                )
+            """)
+            cursor.execute("DELETE FROM candidate_keys")
+            cursor.executemany("INSERT INTO candidate_keys VALUES (?, ?)", keys)
+
+            cursor.execute("""
+                SELECT t.source, t.article_id
+                FROM candidate_keys t
+                LEFT JOIN articles a
+                    ON a.source = t.source AND a.article_id = t.article_id
+                WHERE a.id IS NULL
+            """)
+            new_keys = {(row['source'], row['article_id']) for row in cursor.fetchall()}
+
+            cursor.execute("DELETE FROM candidate_keys")
+            self._commit()
+        return new_keys
 
     def add_article(
         self,
@@ -138,17 +247,85 @@ class ArticleDatabase:
         Returns:
             Article ID in database
         """
-        cursor = self.conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
+            is_new = not self.article_exists(article['source'], article['article_id'])
+
+            cursor.execute(
+                INSERT_ARTICLE_SQL,
+                self._article_params(article, category, subcategory, file_path)
+            )
+
+            if is_new:
+                article_id = cursor.lastrowid
+
+                # Update category stats
+                self._update_category_stats(category, subcategory, article.get('likes_count', 0))
+            else:
+                article_id = cursor.execute(
+                    "SELECT id FROM articles WHERE source = ? AND article_id = ?",
+                    (article['source'], article['article_id'])
+                ).fetchone()['id']
+            self._commit()
+
+        logger.info(f"Added article to database: {article['title']} (ID: {article_id})")
+        return article_id
+
+    def add_articles(self, rows: List[Tuple[Dict, str, str, str]]) -> int:
+        """
+        Add multiple articles to database in bulk
+
+        Args:
+            rows: List of (article, category, subcategory, file_path) tuples
+
+        Returns:
+            Number of articles written
+        """
+        if not rows:
+            return 0
+
+        with self._lock:
+            new_keys = self.filter_new(
+                [(article['source'], article['article_id']) for article, *_ in rows]
+            )
+
+            self.conn.executemany(
+                INSERT_ARTICLE_SQL,
+                [self._article_params(*row) for row in rows]
+            )
+
+            # Aggregate category stat deltas for newly inserted articles
+            # before a single bulk upsert
+            counts = Counter()
+            likes = Counter()
+            for article, category, subcategory, _ in rows:
+                key = (article['source'], article['article_id'])
+                if key not in new_keys:
+                    continue
+                new_keys.discard(key)
+                counts[(category, subcategory)] += 1
+                likes[(category, subcategory)] += article.get('likes_count', 0)
+
+            self._update_category_stats_many(
+                [(cat, subcat, count, likes[(cat, subcat)])
+                 for (cat, subcat), count in counts.items()]
+            )
+            self._commit()
+
+        logger.info(f"Added {len(rows)} articles to database")
+        return len(rows)
 
+    @staticmethod
+    def _article_params(
+        article: Dict,
+        category: str,
+        subcategory: str,
+        file_path: str
+    ) -> Tuple:
+        """Build INSERT_ARTICLE_SQL parameters for an article"""
         tags_json = json.dumps(article.get('tags', []), ensure_ascii=False)
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO articles (
-                source, article_id, url, title, author, author_name,
-                published_at, category, subcategory, file_path,
-                tags, likes_count, stocks_count, is_summarized
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return (
             article['source'],
             article['article_id'],
             article['url'],
@@ -163,31 +340,68 @@ class ArticleDatabase:
             article.get('likes_count', 0),
             article.get('stocks_count', 0),
             1  # is_summarized = True
-        ))
-
-        self.conn.commit()
-        article_id = cursor.lastrowid
-
-        # Update category stats
-        self._update_category_stats(category, subcategory, article.get('likes_count', 0))
-
-        logger.info(f"Added article to database: {article['title']} (ID: {article_id})")
-        return article_id
+        )
 
     def _update_category_stats(self, category: str, subcategory: str, likes: int):
         """Update category statistics"""
-        cursor = self.conn.cursor()
+        self._update_category_stats_many([(category, subcategory, 1, likes)])
 
-        cursor.execute("""
+    def _update_category_stats_many(self, deltas: List[Tuple[str, str, int, int]]):
+        """
+        Update category statistics in bulk
+
+        Args:
+            deltas: List of (category, subcategory, article_count, likes) increments
+        """
+        self.conn.executemany("""
             INSERT INTO category_stats (category, subcategory, article_count, total_likes)
-            VALUES (?, ?, 1, ?)
+            VALUES (?, ?, ?, ?)
             ON CONFLICT(category, subcategory) DO UPDATE SET
-                article_count = article_count + 1,
-                total_likes = total_likes + ?,
+                article_count = article_count + excluded.article_count,
+                total_likes = total_likes + excluded.total_likes,
                 last_updated = CURRENT_TIMESTAMP
-        """, (category, subcategory, likes, likes))
+        """, deltas)
 
-        self.conn.commit()
+    def get_ai_categories(self, keys: List[bytes]) -> Dict[bytes, Tuple[str, str]]:
+        """
+        Look up cached AI categorization verdicts
+
+        Args:
+            keys: List of title/tags digests
+
+        Returns:
+            Dictionary mapping digest to (category, subcategory) for cache hits
+        """
+        hits = {}
+        for i in range(0, len(keys), AI_CACHE_LOOKUP_CHUNK):
+            chunk = keys[i:i + AI_CACHE_LOOKUP_CHUNK]
+            cursor = self.conn.execute(
+                f"SELECT h, cat, subcat FROM ai_cache WHERE h IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                hits[bytes(row['h'])] = (row['cat'], row['subcat'])
+        return hits
+
+    def add_ai_categories(self, rows: List[Tuple[bytes, str, str]]):
+        """
+        Store AI categorization verdicts
+
+        Args:
+            rows: List of (digest, category, subcategory) tuples
+        """
+        if not rows:
+            return
+
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO ai_cache (h, cat, subcat) VALUES (?, ?, ?)
+                ON CONFLICT(h) DO UPDATE SET
+                    cat = excluded.cat,
+                    subcat = excluded.subcat,
+                    ts = CURRENT_TIMESTAMP
+            """, rows)
+            self._commit()
 
     def get_articles_by_category(
         self,
@@ -241,6 +455,63 @@ class ArticleDatabase:
         """)
         return cursor.fetchall()
 
+    def get_category_overviews(
+        self,
+        limit: int = 20
+    ) -> List[Tuple[str, str, List[Dict], Optional[Dict]]]:
+        """
+        Get recent articles and statistics for every category in one query
+
+        Args:
+            limit: Maximum number of articles per category/subcategory
+
+        Returns:
+            List of (category, subcategory, articles, stats) tuples ordered
+            by category; articles are newest first and stats may be None
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            WITH ranked AS (
+                SELECT a.*, ROW_NUMBER() OVER (
+                    PARTITION BY category, subcategory
+                    ORDER BY published_at DESC
+                ) AS rn
+                FROM articles a
+            )
+            SELECT r.*,
+                s.id AS stats_id,
+                s.article_count AS stats_article_count,
+                s.total_likes AS stats_total_likes,
+                s.last_updated AS stats_last_updated
+            FROM ranked r
+            LEFT JOIN category_stats s
+                ON s.category = r.category AND s.subcategory = r.subcategory
+            WHERE r.rn <= ?
+            ORDER BY r.category, r.subcategory, r.rn
+        """, (limit,))
+
+        overviews = []
+        current = None
+        for row in cursor.fetchall():
+            article = dict(row)
+            del article['rn']
+            stats = {
+                'id': article.pop('stats_id'),
+                'category': article['category'],
+                'subcategory': article['subcategory'],
+                'article_count': article.pop('stats_article_count'),
+                'total_likes': article.pop('stats_total_likes'),
+                'last_updated': article.pop('stats_last_updated'),
+            }
+
+            key = (article['category'], article['subcategory'])
+            if current is None or current[:2] != key:
+                current = (*key, [], stats if stats['id'] is not None else None)
+                overviews.append(current)
+            current[2].append(article)
+
+        return overviews
+
     def get_category_stats(self, category: str, subcategory: str) -> Optional[Dict]:
         """
         Get statistics for a category
@@ -294,16 +565,16 @@ class ArticleDatabase:
             List of (tag, count) tuples
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT tags FROM articles WHERE tags IS NOT NULL")
-
-        tag_counts = {}
-        for row in cursor.fetchall():
-            tags = json.loads(row['tags'])
-            for tag in tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        cursor.execute("""
+            SELECT je.value AS tag, COUNT(*) AS tag_count
+            FROM articles, json_each(articles.tags) AS je
+            WHERE articles.tags IS NOT NULL
+            GROUP BY je.value
+            ORDER BY tag_count DESC, tag
+            LIMIT ?
+        """, (limit,))
 
-        sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_tags[:limit]
+        return [(row['tag'], row['tag_count']) for row in cursor.fetchall()]
 
     def close(self):
         """Close database connection"""
@@ -0,0 +1,13 @@
+"""
+Shared default settings
+Values that several modules must agree on
+"""
+
+# Length of the article body excerpt kept for categorization
+BODY_EXCERPT_LENGTH = 1000
+
+# Maximum number of in-flight Claude requests
+DEFAULT_CONCURRENCY = 8
+
+# Claude SDK retries for rate-limited and transient API errors
+API_MAX_RETRIES = 3
@@ -0,0 +1,44 @@
+"""
+HTTP session helper
+Provides pooled, retrying sessions shared by the article fetchers
+"""
+
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool size per host and retry policy for transient failures
+POOL_SIZE = 10
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create a session that reuses connections across requests
+
+    Args:
+        headers: Default headers sent with every request
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -4,9 +4,11 @@ Tech Article Summarizer - Phase 2
 Main entry point with categorization and database support
 """
 
-import os
+import asyncio
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
 from pathlib import Path
 import yaml
@@ -22,6 +24,13 @@ from markdown_generator import MarkdownGenerator
 from categorizer import ArticleCategorizer
 from database import ArticleDatabase
 from path_builder import ArticlePathBuilder
+from defaults import DEFAULT_CONCURRENCY
+
+# Number of processed articles buffered before a bulk database insert
+DB_FLUSH_SIZE = 500
+
+# Maximum number of category READMEs written in parallel
+README_WORKERS = 16
 
 
 def setup_logging(config: dict):
@@ -31,7 +40,7 @@ def setup_logging(config: dict):
     log_format = log_config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # Create logs directory
-    os.makedirs('logs', exist_ok=True)
+    Path('logs').mkdir(exist_ok=True)
 
     # Configure logging
     logging.basicConfig(
@@ -62,19 +71,12 @@ def update_category_readmes(
     logger = logging.getLogger(__name__)
     logger.info("Updating category READMEs...")
 
-    categories = db.get_all_categories()
-
-    for category, subcategory in categories:
+    def write_readme(overview):
+        category, subcategory, articles, stats = overview
         try:
             # Get category info
             category_info = categorizer.get_category_info(category, subcategory)
 
-            # Get recent articles
-            articles = db.get_articles_by_category(category, subcategory, limit=20)
-
-            # Get stats
-            stats = db.get_category_stats(category, subcategory)
-
             # Generate README
             readme_content = md_generator.generate_category_readme(
                 category_info,
@@ -92,8 +94,66 @@ def update_category_readmes(
         except Exception as e:
             logger.error(f"Error updating README for {category}/{subcategory}: {e}")
 
+    # Each category writes its own README file, so they can run in parallel
+    overviews = db.get_category_overviews(limit=20)
+    if overviews:
+        with ThreadPoolExecutor(max_workers=min(README_WORKERS, len(overviews))) as pool:
+            list(pool.map(write_readme, overviews))
+
+
+def fetch_sources(tasks: list) -> list:
+    """
+    Run article fetchers concurrently
+
+    Args:
+        tasks: List of (label, fetch function) tuples
+
+    Returns:
+        List of (label, articles) tuples in task order
+    """
+    if not tasks:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = [(label, pool.submit(fetch)) for label, fetch in tasks]
+        return [(label, future.result()) for label, future in futures]
+
+
+async def analyze_articles(
+    articles: list,
+    categorizer: ArticleCategorizer,
+    summarizer: ArticleSummarizer,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> list:
+    """
+    Categorize and summarize articles concurrently
+
+    Args:
+        articles: New article dictionaries
+        categorizer: Article categorizer
+        summarizer: Article summarizer
+        concurrency: Maximum number of in-flight API requests per stage
+
+    Returns:
+        List of ((category, subcategory), summary_data) tuples in input order.
+        summary_data is the raised exception if summarization failed.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Summaries go through the blocking client on a worker pool sized to
+    # the request concurrency, so at most that many calls are in flight
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        categories, summaries = await asyncio.gather(
+            categorizer.categorize_batch(articles, concurrency=concurrency),
+            asyncio.gather(
+                *[loop.run_in_executor(pool, summarizer.summarize, a) for a in articles],
+                return_exceptions=True
+            )
+        )
+    return list(zip(categories, summaries))
+
 
-def main():
+async def main():
     """Main execution flow"""
     print("🚀 Tech Article Summarizer - Phase 2\n")
     print("📦 新機能: カテゴリ自動分類 + データベース管理\n")
@@ -118,19 +178,24 @@ def main():
         zenn_config = config.get('zenn', {})
         claude_config = config.get('claude', {})
         output_config = config.get('output', {})
+        categorizer_config = config.get('categorizer', {})
+
+        # Initialize database
+        db = ArticleDatabase()
 
         summarizer = ArticleSummarizer(config=claude_config)
-        categorizer = ArticleCategorizer()
+        categorizer = ArticleCategorizer(
+            embedding_model=categorizer_config.get('embedding_model'),
+            top_k=categorizer_config.get('top_k', 8),
+            db=db
+        )
         md_generator = MarkdownGenerator()
         path_builder = ArticlePathBuilder(output_config.get('base_dir', 'articles'))
 
-        # Initialize database
-        db = ArticleDatabase()
-
         print("✅ コンポーネント初期化完了\n")
 
-        # Fetch articles from multiple sources
-        articles = []
+        # Fetch articles from multiple sources concurrently
+        fetch_tasks = []
 
         # Fetch from Qiita
         if qiita_config.get('enabled', True):
@@ -138,14 +203,14 @@ def main():
             print("📡 Qiitaから記事を取得中...\n")
 
             qiita_fetcher = QiitaFetcher(config=qiita_config)
-            qiita_articles = qiita_fetcher.fetch_recent_articles(
+            fetch_tasks.append(("Qiita", partial(
+                qiita_fetcher.fetch_recent_articles,
                 days_back=qiita_config.get('days_back', 1),
                 per_page=qiita_config.get('per_page', 20),
                 min_likes=qiita_config.get('min_likes', 10),
-                query=qiita_config.get('query', '')
-            )
-            articles.extend(qiita_articles)
-            print(f"  Qiita: {len(qiita_articles)}件\n")
+                query=qiita_config.get('query', ''),
+                max_pages=qiita_config.get('max_pages', 1)
+            )))
 
         # Fetch from Zenn
         if zenn_config.get('enabled', True):
@@ -153,24 +218,25 @@ def main():
             print("📡 Zennから記事を取得中...\n")
 
             zenn_fetcher = ZennFetcher(config=zenn_config)
-            zenn_articles = zenn_fetcher.fetch_recent_articles(
+            fetch_tasks.append(("Zenn", partial(
+                zenn_fetcher.fetch_recent_articles,
                 days_back=zenn_config.get('days_back', 1),
                 max_articles=zenn_config.get('max_articles', 50)
-            )
-            articles.extend(zenn_articles)
-            print(f"  Zenn: {len(zenn_articles)}件\n")
+            )))
 
             # Fetch from Zenn topics if specified
-            topics = zenn_config.get('topics', [])
-            if topics:
-                for topic in topics:
-                    topic_articles = zenn_fetcher.fetch_topic_articles(
-                        topic=topic,
-                        days_back=zenn_config.get('days_back', 7),
-                        max_articles=20
-                    )
-                    articles.extend(topic_articles)
-                    print(f"  Zenn ({topic}): {len(topic_articles)}件\n")
+            for topic in zenn_config.get('topics', []):
+                fetch_tasks.append((f"Zenn ({topic})", partial(
+                    zenn_fetcher.fetch_topic_articles,
+                    topic=topic,
+                    days_back=zenn_config.get('days_back', 7),
+                    max_articles=20
+                )))
+
+        articles = []
+        for label, source_articles in fetch_sources(fetch_tasks):
+            articles.extend(source_articles)
+            print(f"  {label}: {len(source_articles)}件\n")
 
         if not articles:
             logger.warning("No articles found matching criteria")
@@ -180,10 +246,15 @@ def main():
 
         print(f"✅ 合計 {len(articles)}件の記事を取得しました\n")
 
-        # Filter out duplicates
+        # Filter out duplicates (already stored or fetched twice)
+        new_keys = db.filter_new(
+            [(article['source'], article['article_id']) for article in articles]
+        )
         new_articles = []
         for article in articles:
-            if not db.article_exists(article['source'], article['article_id']):
+            key = (article['source'], article['article_id'])
+            if key in new_keys:
+                new_keys.discard(key)
                 new_articles.append(article)
             else:
                 logger.info(f"Skipping duplicate: {article['title']}")
@@ -198,59 +269,71 @@ def main():
         # Process each article
         print("⚙️  記事を処理中...\n")
 
+        # Categorize + summarize all articles in parallel
+        results = await analyze_articles(
+            new_articles,
+            categorizer,
+            summarizer,
+            concurrency=claude_config.get('concurrency', DEFAULT_CONCURRENCY)
+        )
+
         processed_count = 0
         category_counts = {}
+        pending_rows = []
+
+        # Write files and DB rows serially, committing once at the end
+        with db.transaction():
+            for i, (article, ((category, subcategory), summary_data)) in enumerate(
+                zip(new_articles, results), 1
+            ):
+                try:
+                    print(f"[{i}/{len(new_articles)}] {article['title'][:50]}...")
 
-        for i, article in enumerate(new_articles, 1):
-            try:
-                print(f"[{i}/{len(new_articles)}] {article['title'][:50]}...")
+                    if isinstance(summary_data, Exception):
+                        raise summary_data
 
-                # Categorize
-                category, subcategory = categorizer.categorize(
-                    article['title'],
-                    article['tags'],
-                    article.get('body', '')[:1000]
-                )
+                    category_info = categorizer.get_category_info(category, subcategory)
+                    logger.info(f"  → {category}/{subcategory}")
 
-                category_info = categorizer.get_category_info(category, subcategory)
-                logger.info(f"  → {category}/{subcategory}")
+                    article.update(summary_data)
 
-                # Summarize
-                summary_data = summarizer.summarize(article)
-                article.update(summary_data)
+                    # Generate file path
+                    file_path = path_builder.get_article_path(
+                        category,
+                        subcategory,
+                        article['published_at']
+                    )
 
-                # Generate file path
-                file_path = path_builder.get_article_path(
-                    category,
-                    subcategory,
-                    article['published_at']
-                )
+                    # Generate markdown
+                    article_md = md_generator.generate_category_article(article, category_info)
 
-                # Generate markdown
-                article_md = md_generator.generate_category_article(article, category_info)
+                    # Append to file
+                    md_generator.append_to_file(article_md, file_path)
 
-                # Append to file
-                md_generator.append_to_file(article_md, file_path)
+                    # Queue for bulk database insert
+                    pending_rows.append((article, category, subcategory, str(file_path)))
+                    if len(pending_rows) >= DB_FLUSH_SIZE:
+                        db.add_articles(pending_rows)
+                        pending_rows = []
 
-                # Save to database
-                db.add_article(article, category, subcategory, str(file_path))
+                    # Track stats
+                    cat_key = f"{category}/{subcategory}"
+                    category_counts[cat_key] = category_counts.get(cat_key, 0) + 1
 
-                # Track stats
-                cat_key = f"{category}/{subcategory}"
-                category_counts[cat_key] = category_counts.get(cat_key, 0) + 1
+                    processed_count += 1
+                    print(f"  ✓ 保存完了: {category_info['subcategory_name']}\n")
 
-                processed_count += 1
-                print(f"  ✓ 保存完了: {category_info['subcategory_name']}\n")
+                except Exception as e:
+                    logger.error(f"Error processing article: {article['title']}", exc_info=e)
+                    print(f"  ✗ エラー: {str(e)}\n")
+                    continue
 
-            except Exception as e:
-                logger.error(f"Error processing article: {article['title']}", exc_info=e)
-                print(f"  ✗ エラー: {str(e)}\n")
-                continue
+            db.add_articles(pending_rows)
 
         print("\n" + "=" * 60)
-        print(f"📊 処理結果\n")
+        print("📊 処理結果\n")
         print(f"  処理件数: {processed_count}件")
-        print(f"\n  カテゴリ別:")
+        print("\n  カテゴリ別:")
         for cat, count in sorted(category_counts.items()):
             print(f"    - {cat}: {count}件")
         print("=" * 60 + "\n")
@@ -280,4 +363,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())
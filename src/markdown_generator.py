@@ -3,13 +3,28 @@ Markdown file generator
 Creates formatted markdown files from article data
 """
 
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import Iterable, List, Dict, Optional
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Separator written after each appended article
+ENTRY_SEPARATOR = "\n\n---\n\n"
+
+# Write buffer size for bulk appends
+APPEND_BUFFER_SIZE = 1 << 16
+
+# Fragments shared by the article and report layouts
+_SEP = "\n---\n\n"
+_META_HEADER = "**メタ情報:**\n\n"
+_SUMMARY_HEADER = "**要約:**\n\n"
+_KEYPOINTS_HEADER = "**キーポイント:**\n\n"
+_TECH_HEADER = "**使用技術:**\n\n"
+
 
 class MarkdownGenerator:
     """Generates markdown files from article data"""
@@ -29,45 +44,33 @@ class MarkdownGenerator:
         Returns:
             Markdown formatted string
         """
-        md = f"## [{article['title']}]({article['url']})\n\n"
+        parts = [f"## [{article['title']}]({article['url']})\n\n"]
 
         # Category badge
-        md += f"> 📁 **{category_info['category_name']}** › **{category_info['subcategory_name']}**\n\n"
+        parts.append(f"> 📁 **{category_info['category_name']}** › **{category_info['subcategory_name']}**\n\n")
 
         # Meta info
-        md += "**メタ情報:**\n\n"
-        md += f"- 📝 著者: [@{article['author']}]({article['author_url']})\n"
+        parts.append(_META_HEADER)
+        parts.append(f"- 📝 著者: [@{article['author']}]({article['author_url']})\n")
 
         published_at = article['published_at']
         if isinstance(published_at, str):
-            md += f"- 📅 投稿日: {published_at}\n"
+            parts.append(f"- 📅 投稿日: {published_at}\n")
         else:
-            md += f"- 📅 投稿日: {published_at.strftime('%Y-%m-%d %H:%M')}\n"
+            parts.append(f"- 📅 投稿日: {published_at:%Y-%m-%d %H:%M}\n")
 
-        md += f"- ❤️ いいね: {article['likes_count']}\n"
-        md += f"- 🔖 ストック: {article.get('stocks_count', 0)}\n"
-        md += f"- 🏷️ タグ: {', '.join(article['tags'])}\n"
-        md += f"- 🌐 ソース: {article['source'].upper()}\n\n"
+        parts.append(f"- ❤️ いいね: {article['likes_count']}\n")
+        parts.append(f"- 🔖 ストック: {article.get('stocks_count', 0)}\n")
+        parts.append(f"- 🏷️ タグ: {', '.join(article['tags'])}\n")
+        parts.append(f"- 🌐 ソース: {article['source'].upper()}\n\n")
 
         # Summary
-        md += "**要約:**\n\n"
-        md += f"{article.get('summary', '要約なし')}\n\n"
+        parts.append(_SUMMARY_HEADER)
+        parts.append(f"{article.get('summary', '要約なし')}\n\n")
 
-        # Key points
-        if article.get('key_points'):
-            md += "**キーポイント:**\n\n"
-            for point in article['key_points']:
-                md += f"- {point}\n"
-            md += "\n"
+        self._append_details(parts, article)
 
-        # Tech stack
-        if article.get('tech_stack'):
-            md += "**使用技術:**\n\n"
-            for tech in article['tech_stack']:
-                md += f"- {tech}\n"
-            md += "\n"
-
-        return md
+        return "".join(parts)
 
     def generate_daily_report(
         self,
@@ -84,86 +87,87 @@ class MarkdownGenerator:
         Returns:
             Markdown formatted string
         """
-        date_str = date.strftime('%Y-%m-%d')
+        count = len(articles)
 
         # Header
-        md = f"# 技術記事まとめ - {date_str}\n\n"
-        md += f"> 📅 生成日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        parts = [f"# 技術記事まとめ - {date:%Y-%m-%d}\n\n"]
+        parts.append(f"> 📅 生成日時: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n")
 
         # Summary stats
-        md += "## 📊 サマリー\n\n"
-        md += f"- 記事数: {len(articles)}件\n"
+        parts.append("## 📊 サマリー\n\n")
+        parts.append(f"- 記事数: {count}件\n")
 
         if articles:
-            avg_likes = sum(a['likes_count'] for a in articles) / len(articles)
-            md += f"- 平均いいね数: {avg_likes:.1f}\n"
+            avg_likes = sum(a['likes_count'] for a in articles) / count
+            parts.append(f"- 平均いいね数: {avg_likes:.1f}\n")
 
             # Top tags
-            all_tags = []
-            for article in articles:
-                all_tags.extend(article['tags'])
-
-            if all_tags:
-                tag_counts = {}
-                for tag in all_tags:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            tag_counts = Counter(chain.from_iterable(a['tags'] for a in articles))
+            if tag_counts:
+                top_tags = [tag for tag, _ in tag_counts.most_common(5)]
+                parts.append(f"- 人気タグ: {', '.join(top_tags)}\n")
 
-                top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-                md += f"- 人気タグ: {', '.join([tag for tag, _ in top_tags])}\n"
+        parts.append(_SEP)
 
-        md += "\n---\n\n"
-
-        # Articles
+        # Articles (hot loop: bind method lookups once)
+        format_article = self._format_article
+        append = parts.append
         for i, article in enumerate(articles, 1):
-            md += self._format_article(article, i)
-            md += "\n---\n\n"
+            format_article(parts, article, i)
+            append(_SEP)
 
         # Footer
-        md += f"*このレポートは自動生成されました*\n"
+        parts.append("*このレポートは自動生成されました*\n")
 
-        return md
+        return "".join(parts)
 
-    def _format_article(self, article: Dict, index: int) -> str:
+    def _format_article(self, parts: List[str], article: Dict, index: int):
         """
         Format single article as markdown
 
         Args:
+            parts: Output chunks to append to
             article: Article dictionary with summary
             index: Article number
-
-        Returns:
-            Markdown formatted string
         """
-        md = f"## {index}. [{article['title']}]({article['url']})\n\n"
+        append = parts.append
+        append(f"## {index}. [{article['title']}]({article['url']})\n\n")
 
         # Meta info
-        md += "**メタ情報:**\n\n"
-        md += f"- 📝 著者: [@{article['author']}]({article['author_url']})\n"
-        md += f"- 📅 投稿日: {article['published_at'].strftime('%Y-%m-%d %H:%M')}\n"
-        md += f"- ❤️ いいね: {article['likes_count']}\n"
-        md += f"- 🔖 ストック: {article['stocks_count']}\n"
-        md += f"- 🏷️ タグ: {', '.join(article['tags'])}\n"
-        md += f"- 🌐 ソース: Qiita\n\n"
+        append(_META_HEADER)
+        append(f"- 📝 著者: [@{article['author']}]({article['author_url']})\n")
+        append(f"- 📅 投稿日: {article['published_at']:%Y-%m-%d %H:%M}\n")
+        append(f"- ❤️ いいね: {article['likes_count']}\n")
+        append(f"- 🔖 ストック: {article['stocks_count']}\n")
+        append(f"- 🏷️ タグ: {', '.join(article['tags'])}\n")
+        append("- 🌐 ソース: Qiita\n\n")
 
         # Summary
-        md += "**要約:**\n\n"
-        md += f"{article['summary']}\n\n"
+        append(_SUMMARY_HEADER)
+        append(f"{article['summary']}\n\n")
 
+        self._append_details(parts, article)
+
+    @staticmethod
+    def _append_details(parts: List[str], article: Dict):
+        """
+        Append key points and tech stack sections
+
+        Args:
+            parts: Output chunks to append to
+            article: Article dictionary with summary
+        """
         # Key points
         if article.get('key_points'):
-            md += "**キーポイント:**\n\n"
-            for point in article['key_points']:
-                md += f"- {point}\n"
-            md += "\n"
+            parts.append(_KEYPOINTS_HEADER)
+            parts.extend([f"- {point}\n" for point in article['key_points']])
+            parts.append("\n")
 
         # Tech stack
         if article.get('tech_stack'):
-            md += "**使用技術:**\n\n"
-            for tech in article['tech_stack']:
-                md += f"- {tech}\n"
-            md += "\n"
-
-        return md
+            parts.append(_TECH_HEADER)
+            parts.extend([f"- {tech}\n" for tech in article['tech_stack']])
+            parts.append("\n")
 
     def generate_category_readme(
         self,
@@ -182,34 +186,34 @@ class MarkdownGenerator:
         Returns:
             Markdown formatted string
         """
-        md = f"# {category_info['subcategory_name']}\n\n"
-        md += f"> {category_info['category_description']}\n\n"
+        parts = [f"# {category_info['subcategory_name']}\n\n"]
+        parts.append(f"> {category_info['category_description']}\n\n")
 
         # Stats
         if stats:
-            md += "## 📊 統計情報\n\n"
-            md += f"- 総記事数: {stats.get('article_count', 0)}件\n"
-            md += f"- 総いいね数: {stats.get('total_likes', 0)}\n"
-            md += f"- 最終更新: {stats.get('last_updated', 'N/A')}\n\n"
+            parts.append("## 📊 統計情報\n\n")
+            parts.append(f"- 総記事数: {stats.get('article_count', 0)}件\n")
+            parts.append(f"- 総いいね数: {stats.get('total_likes', 0)}\n")
+            parts.append(f"- 最終更新: {stats.get('last_updated', 'N/A')}\n\n")
 
         # Recent articles
         if articles:
-            md += "## 📅 最近の記事\n\n"
+            parts.append("## 📅 最近の記事\n\n")
             for article in articles[:10]:
                 published_at = article.get('published_at', '')
                 if isinstance(published_at, datetime):
-                    date_str = published_at.strftime('%Y-%m-%d')
+                    date_str = f"{published_at:%Y-%m-%d}"
                 else:
                     date_str = str(published_at)[:10] if published_at else 'N/A'
 
-                md += f"- [{article['title']}]({article['url']}) "
-                md += f"- {date_str} ({article['likes_count']} いいね)\n"
-            md += "\n"
+                parts.append(f"- [{article['title']}]({article['url']}) ")
+                parts.append(f"- {date_str} ({article['likes_count']} いいね)\n")
+            parts.append("\n")
 
-        md += "---\n\n"
-        md += f"*最終更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        parts.append("---\n\n")
+        parts.append(f"*最終更新: {datetime.now():%Y-%m-%d %H:%M:%S}*\n")
 
-        return md
+        return "".join(parts)
 
     def save_report(
         self,
@@ -228,16 +232,14 @@ class MarkdownGenerator:
         Returns:
             Path to saved file
         """
-        import os
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
 
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        filepath = output_path / filename
+        filepath.write_text(content, encoding='utf-8')
 
         logger.info(f"Report saved to: {filepath}")
-        return filepath
+        return str(filepath)
 
     def append_to_file(
         self,
@@ -254,7 +256,32 @@ class MarkdownGenerator:
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
         with open(filepath, 'a', encoding='utf-8') as f:
-            f.write(content)
-            f.write("\n\n---\n\n")
+            f.write(content + ENTRY_SEPARATOR)
 
         logger.info(f"Appended content to: {filepath}")
+
+    def append_many(
+        self,
+        items: Iterable[str],
+        filepath: Path
+    ) -> int:
+        """
+        Append several entries to a file, opening it once
+
+        Args:
+            items: Contents to append, each followed by the separator
+            filepath: Path to file
+
+        Returns:
+            Number of entries appended
+        """
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        count = 0
+        with open(filepath, 'a', encoding='utf-8', buffering=APPEND_BUFFER_SIZE) as f:
+            for content in items:
+                f.write(content + ENTRY_SEPARATOR)
+                count += 1
+
+        logger.info(f"Appended {count} entries to: {filepath}")
+        return count
@@ -5,11 +5,16 @@ Manages article file paths based on category and date
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
 import logging
+import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# Month directory names (YYYY-MM)
+_YM_RE = re.compile(r'\d{4}-\d{2}')
+
 
 class ArticlePathBuilder:
     """Builds file paths for categorized articles"""
@@ -24,6 +29,9 @@ class ArticlePathBuilder:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
 
+        # Directories already created by this builder (skips repeat mkdir calls)
+        self._ensured_dirs: Set[Path] = set()
+
     def get_article_path(
         self,
         category: str,
@@ -51,7 +59,7 @@ class ArticlePathBuilder:
         path = self.base_dir / category / subcategory / year_month / filename
 
         if create_dirs:
-            path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(path.parent)
 
         return path
 
@@ -102,9 +110,20 @@ class ArticlePathBuilder:
             subcategory: Subcategory
         """
         category_dir = self.get_category_dir(category, subcategory)
-        category_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(category_dir)
         logger.debug(f"Ensured directory exists: {category_dir}")
 
+    def _ensure_dir(self, directory: Path):
+        """
+        Create a directory once per builder
+
+        Args:
+            directory: Directory to create
+        """
+        if directory not in self._ensured_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(directory)
+
     def list_category_months(
         self,
         category: str,
@@ -125,12 +144,12 @@ class ArticlePathBuilder:
         if not category_dir.exists():
             return []
 
-        months = []
-        for month_dir in sorted(category_dir.iterdir()):
-            if month_dir.is_dir() and month_dir.name.match(r'\d{4}-\d{2}'):
-                months.append((month_dir.name, month_dir))
-
-        return months
+        # DirEntry carries the file type, so no stat() per entry
+        with os.scandir(category_dir) as entries:
+            return sorted(
+                (entry.name, Path(entry.path)) for entry in entries
+                if entry.is_dir(follow_symlinks=False) and _YM_RE.fullmatch(entry.name)
+            )
 
     def list_articles_in_month(
         self,
@@ -154,7 +173,11 @@ class ArticlePathBuilder:
         if not month_dir.exists():
             return []
 
-        return sorted(month_dir.glob("*.md"))
+        with os.scandir(month_dir) as entries:
+            return sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.md')
+            )
 
     def get_relative_path(self, full_path: Path) -> str:
         """
@@ -4,13 +4,30 @@ Fetches recent articles from Qiita based on configuration
 """
 
 import os
+import sys
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
 
+from defaults import BODY_EXCERPT_LENGTH
+from http_client import create_session
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    from json import loads as _loads
+
 logger = logging.getLogger(__name__)
 
+# datetime.fromisoformat accepts a trailing 'Z' from Python 3.11
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        """Parse an ISO 8601 timestamp that may end in 'Z'"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class QiitaFetcher:
     """Fetches articles from Qiita API"""
@@ -33,13 +50,16 @@ class QiitaFetcher:
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json'
         }
+        # Pooled keep-alive connections shared by all requests
+        self.session = create_session(self.headers)
 
     def fetch_recent_articles(
         self,
         days_back: int = 1,
         per_page: int = 20,
         min_likes: int = 10,
-        query: str = ""
+        query: str = "",
+        max_pages: int = 1
     ) -> List[Dict]:
         """
         Fetch recent articles from Qiita
@@ -49,6 +69,7 @@ class QiitaFetcher:
             per_page: Number of articles per request (max 100)
             min_likes: Minimum number of likes
             query: Optional search query
+            max_pages: Maximum number of result pages to fetch
 
         Returns:
             List of article dictionaries
@@ -68,23 +89,24 @@ class QiitaFetcher:
         articles = []
         page = 1
 
-        while True:
+        per_page = min(per_page, 100)
+
+        while page <= max_pages:
             params = {
                 'page': page,
-                'per_page': min(per_page, 100),
+                'per_page': per_page,
                 'query': search_query
             }
 
             try:
-                response = requests.get(
+                response = self.session.get(
                     f"{self.base_url}/items",
-                    headers=self.headers,
                     params=params,
                     timeout=30
                 )
                 response.raise_for_status()
 
-                items = response.json()
+                items = _loads(response.content)
 
                 if not items:
                     break
@@ -96,10 +118,12 @@ class QiitaFetcher:
 
                 logger.info(f"Fetched page {page}: {len(items)} articles")
 
-                # For MVP, only fetch first page
-                break
+                # A short page is the last one
+                if len(items) < per_page:
+                    break
+                page += 1
 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 logger.error(f"Error fetching articles: {e}")
                 break
 
@@ -116,20 +140,23 @@ class QiitaFetcher:
         Returns:
             Parsed article dictionary
         """
+        body = item.get('body', '')
+        user_id = item['user']['id']
         return {
             'source': 'qiita',
             'article_id': item['id'],
             'title': item['title'],
             'url': item['url'],
-            'author': item['user']['id'],
-            'author_name': item['user']['name'] or item['user']['id'],
-            'author_url': f"https://qiita.com/{item['user']['id']}",
-            'published_at': datetime.fromisoformat(item['created_at'].replace('Z', '+00:00')),
-            'updated_at': datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00')),
+            'author': user_id,
+            'author_name': item['user']['name'] or user_id,
+            'author_url': f"https://qiita.com/{user_id}",
+            'published_at': _parse_iso(item['created_at']),
+            'updated_at': _parse_iso(item['updated_at']),
             'likes_count': item['likes_count'],
             'stocks_count': item.get('stocks_count', 0),
             'tags': [tag['name'] for tag in item['tags']],
-            'body': item.get('body', ''),
+            'body': body,
+            'body_excerpt': body[:BODY_EXCERPT_LENGTH],
             'rendered_body': item.get('rendered_body', ''),
         }
 
@@ -144,13 +171,12 @@ class QiitaFetcher:
             Article body or None
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/items/{article_id}",
-                headers=self.headers,
                 timeout=30
             )
             response.raise_for_status()
-            return response.json().get('body', '')
-        except requests.exceptions.RequestException as e:
+            return _loads(response.content).get('body', '')
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error fetching article {article_id}: {e}")
             return None
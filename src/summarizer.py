@@ -3,13 +3,70 @@ Article summarization module using Claude API
 Generates concise summaries and key points from technical articles
 """
 
+import json
 import os
+import re
 import anthropic
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import logging
 
+from defaults import API_MAX_RETRIES, DEFAULT_CONCURRENCY
+
 logger = logging.getLogger(__name__)
 
+# Article body characters sent to Claude
+PROMPT_BODY_LIMIT = 5000
+
+# Article body characters per article in a combined prompt
+COMBINED_BODY_LIMIT = 2000
+
+# Response section headers (any line containing "## 要約", "### 要約",
+# "**## 要約**" etc.), bullet items, and summary prose lines (anything that
+# is not a bullet or a header)
+_SECTION_RE = re.compile(
+    r'^[^\n]*?## ?(要約|キーポイント|技術スタック)[^\n]*$', re.M
+)
+_BULLET_RE = re.compile(r'^[^\S\n]*[-•]+[^\S\n]*(\S[^\n]*?)[^\S\n]*$', re.M)
+_SUMMARY_LINE_RE = re.compile(r'^[^\S\n]*([^-#\s][^\n]*?)[^\S\n]*$', re.M)
+
+# Constant instructions appended to every summarization prompt
+_PROMPT_TAIL = """# 要求事項
+以下の形式で応答してください：
+
+## 要約
+（3-4文で記事の内容を簡潔にまとめてください）
+
+## キーポイント
+- （重要なポイント1）
+- （重要なポイント2）
+- （重要なポイント3）
+
+## 技術スタック
+- （使用されている技術1）
+- （使用されている技術2）
+
+注意：
+- 専門用語はそのまま使用してください
+- 実装の詳細よりも、何ができるか・何を解決するかを重視してください
+- コードスニペットは含めないでください
+"""
+
+# Constant instructions appended to every combined summarization prompt
+_COMBINED_PROMPT_TAIL = """# 要求事項
+各記事について、以下の形式のJSON配列のみで応答してください（他の説明は不要）：
+
+[
+  {"index": 1, "summary": "3-4文の要約", "key_points": ["ポイント1", "ポイント2", "ポイント3"], "tech_stack": ["技術1", "技術2"]}
+]
+
+注意：
+- indexは記事番号と一致させてください
+- 専門用語はそのまま使用してください
+- 実装の詳細よりも、何ができるか・何を解決するかを重視してください
+- コードスニペットは含めないでください
+"""
+
 
 class ArticleSummarizer:
     """Summarizes articles using Claude AI"""
@@ -26,8 +83,12 @@ class ArticleSummarizer:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY is required")
 
-        self.client = anthropic.Anthropic(api_key=api_key)
         self.config = config or {}
+        # The SDK retries 429/5xx responses with exponential backoff
+        self.client = anthropic.Anthropic(
+            api_key=api_key,
+            max_retries=self.config.get('max_retries', API_MAX_RETRIES)
+        )
         self.model = self.config.get('model', 'claude-sonnet-4-20250514')
         self.max_tokens = self.config.get('max_tokens', 1000)
         self.temperature = self.config.get('temperature', 0.3)
@@ -47,15 +108,7 @@ class ArticleSummarizer:
         prompt = self._build_prompt(article)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
+            message = self._create_message(prompt)
 
             response_text = message.content[0].text
             summary_data = self._parse_response(response_text)
@@ -71,6 +124,27 @@ class ArticleSummarizer:
                 'tech_stack': []
             }
 
+    def _create_message(self, prompt: str, max_tokens: Optional[int] = None):
+        """
+        Send a prompt to Claude
+
+        Args:
+            prompt: Prompt text
+            max_tokens: Response token limit (defaults to the configured one)
+
+        Returns:
+            Claude message response
+        """
+        return self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature,
+            messages=[{
+                "role": "user",
+                "content": prompt
+            }]
+        )
+
     def _build_prompt(self, article: Dict) -> str:
         """
         Build prompt for Claude API
@@ -81,40 +155,19 @@ class ArticleSummarizer:
         Returns:
             Formatted prompt string
         """
-        title = article['title']
         tags = ', '.join(article['tags'])
-        body = article['body'][:5000]  # Limit to first 5000 chars for MVP
-
-        prompt = f"""以下の技術記事を要約してください。
-
-# 記事情報
-- タイトル: {title}
-- タグ: {tags}
-
-# 記事本文
-{body}
-
-# 要求事項
-以下の形式で応答してください：
-
-## 要約
-（3-4文で記事の内容を簡潔にまとめてください）
-
-## キーポイント
-- （重要なポイント1）
-- （重要なポイント2）
-- （重要なポイント3）
-
-## 技術スタック
-- （使用されている技術1）
-- （使用されている技術2）
-
-注意：
-- 専門用語はそのまま使用してください
-- 実装の詳細よりも、何ができるか・何を解決するかを重視してください
-- コードスニペットは含めないでください
-"""
-        return prompt
+        body = article['body']
+        if len(body) > PROMPT_BODY_LIMIT:
+            body = body[:PROMPT_BODY_LIMIT]
+
+        return (
+            "以下の技術記事を要約してください。\n\n"
+            "# 記事情報\n"
+            f"- タイトル: {article['title']}\n"
+            f"- タグ: {tags}\n\n"
+            "# 記事本文\n"
+            f"{body}\n\n"
+        ) + _PROMPT_TAIL
 
     def _parse_response(self, response: str) -> Dict:
         """
@@ -126,73 +179,190 @@ class ArticleSummarizer:
         Returns:
             Parsed dictionary
         """
-        lines = response.strip().split('\n')
+        sections = {'要約': [], 'キーポイント': [], '技術スタック': []}
 
-        summary = []
-        key_points = []
-        tech_stack = []
+        # Alternating [preamble, name, body, name, body, ...]
+        chunks = _SECTION_RE.split(response)
+        for name, body in zip(chunks[1::2], chunks[2::2]):
+            if name == '要約':
+                sections[name].extend(_SUMMARY_LINE_RE.findall(body))
+            else:
+                sections[name].extend(_BULLET_RE.findall(body))
 
-        current_section = None
+        summary = sections['要約']
+        return {
+            'summary': ' '.join(summary) if summary else 'No summary available',
+            'key_points': sections['キーポイント'],
+            'tech_stack': sections['技術スタック']
+        }
 
-        for line in lines:
-            line = line.strip()
+    def summarize_batch(
+        self,
+        articles: List[Dict],
+        max_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Summarize multiple articles concurrently
 
-            if not line:
-                continue
+        Args:
+            articles: List of article dictionaries
+            max_workers: Number of parallel requests
+                (defaults to the configured concurrency)
 
-            # Detect sections
-            if '## 要約' in line or '##要約' in line:
-                current_section = 'summary'
-                continue
-            elif '## キーポイント' in line or '##キーポイント' in line:
-                current_section = 'key_points'
-                continue
-            elif '## 技術スタック' in line or '##技術スタック' in line:
-                current_section = 'tech_stack'
-                continue
+        Returns:
+            List of articles with added summary data, in input order
+        """
+        logger.info(f"Summarizing {len(articles)} articles...")
 
-            # Skip markdown headers
-            if line.startswith('#'):
-                continue
+        if not articles:
+            return []
 
-            # Add content to appropriate section
-            if current_section == 'summary':
-                if line and not line.startswith('-'):
-                    summary.append(line)
-            elif current_section == 'key_points':
-                if line.startswith('-') or line.startswith('•'):
-                    key_points.append(line.lstrip('-•').strip())
-            elif current_section == 'tech_stack':
-                if line.startswith('-') or line.startswith('•'):
-                    tech_stack.append(line.lstrip('-•').strip())
+        max_workers = max_workers or self.config.get('concurrency', DEFAULT_CONCURRENCY)
 
-        return {
-            'summary': ' '.join(summary) if summary else 'No summary available',
-            'key_points': key_points,
-            'tech_stack': tech_stack
-        }
+        # The Anthropic client is thread-safe; map() keeps input order
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(articles))) as pool:
+            summaries = list(pool.map(self.summarize, articles))
+
+        # Merge summary data into articles
+        return [
+            {**article, **summary_data}
+            for article, summary_data in zip(articles, summaries)
+        ]
 
-    def summarize_batch(self, articles: List[Dict]) -> List[Dict]:
+    def summarize_combined(
+        self,
+        articles: List[Dict],
+        batch_size: int = 5,
+        max_workers: Optional[int] = None
+    ) -> List[Dict]:
         """
-        Summarize multiple articles
+        Summarize articles several per request
+
+        Each request carries up to batch_size articles and asks for a JSON
+        array of summaries. Articles missing from a response, or whose
+        request failed, are summarized individually.
 
         Args:
             articles: List of article dictionaries
+            batch_size: Number of articles per request
+            max_workers: Number of parallel requests
+                (defaults to the configured concurrency)
 
         Returns:
-            List of articles with added summary data
+            List of articles with added summary data, in input order
         """
-        logger.info(f"Summarizing {len(articles)} articles...")
+        logger.info(f"Summarizing {len(articles)} articles in groups of {batch_size}...")
+
+        if not articles:
+            return []
+
+        batches = [
+            articles[i:i + batch_size]
+            for i in range(0, len(articles), batch_size)
+        ]
+        max_workers = max_workers or self.config.get('concurrency', DEFAULT_CONCURRENCY)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            summaries = [
+                summary
+                for batch_summaries in pool.map(self._summarize_group, batches)
+                for summary in batch_summaries
+            ]
+
+        # Merge summary data into articles
+        return [
+            {**article, **summary_data}
+            for article, summary_data in zip(articles, summaries)
+        ]
+
+    def _summarize_group(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Summarize a group of articles with one request
 
-        summarized_articles = []
+        Args:
+            articles: Articles sharing the request
 
+        Returns:
+            Summary dictionaries aligned with articles
+        """
+        results: List[Optional[Dict]] = [None] * len(articles)
+
+        try:
+            message = self._create_message(
+                self._build_combined_prompt(articles),
+                max_tokens=self.max_tokens * len(articles)
+            )
+            for index, summary_data in self._parse_combined_response(
+                message.content[0].text
+            ).items():
+                if 0 <= index < len(articles):
+                    results[index] = summary_data
+
+        except Exception as e:
+            logger.error(f"Error summarizing article group: {e}")
+
+        # Fall back to one request per article for anything left over
+        for i, article in enumerate(articles):
+            if results[i] is None:
+                results[i] = self.summarize(article)
+
+        return results
+
+    def _build_combined_prompt(self, articles: List[Dict]) -> str:
+        """
+        Build prompt covering several articles
+
+        Args:
+            articles: Article dictionaries
+
+        Returns:
+            Formatted prompt string
+        """
+        parts = [f"以下の技術記事{len(articles)}件をそれぞれ要約してください。\n\n"]
         for i, article in enumerate(articles, 1):
-            logger.info(f"Processing {i}/{len(articles)}")
+            body = article['body']
+            if len(body) > COMBINED_BODY_LIMIT:
+                body = body[:COMBINED_BODY_LIMIT]
+            parts.append(
+                f"=== ARTICLE {i} ===\n"
+                f"- タイトル: {article['title']}\n"
+                f"- タグ: {', '.join(article['tags'])}\n\n"
+                f"{body}\n\n"
+            )
+        parts.append(_COMBINED_PROMPT_TAIL)
+        return "".join(parts)
+
+    def _parse_combined_response(self, response: str) -> Dict[int, Dict]:
+        """
+        Parse a JSON array of summaries
+
+        Args:
+            response: Raw response text
 
-            summary_data = self.summarize(article)
+        Returns:
+            Dictionary mapping 0-based article index to summary data;
+            malformed entries are skipped
+        """
+        start = response.find('[')
+        end = response.rfind(']')
+        if start == -1 or end < start:
+            return {}
 
-            # Merge summary data into article
-            article_with_summary = {**article, **summary_data}
-            summarized_articles.append(article_with_summary)
+        try:
+            entries = json.loads(response[start:end + 1])
+        except ValueError:
+            return {}
 
-        return summarized_articles
+        results = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or not isinstance(entry.get('index'), int):
+                continue
+            summary = entry.get('summary')
+            if not isinstance(summary, str) or not summary.strip():
+                continue
+            results[entry['index'] - 1] = {
+                'summary': summary.strip(),
+                'key_points': [str(p) for p in entry.get('key_points') or []],
+                'tech_stack': [str(t) for t in entry.get('tech_stack') or []]
+            }
+        return results
@@ -4,14 +4,39 @@ Fetches recent articles from Zenn via RSS feed
 """
 
 import requests
+import urllib3
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, List, Dict, Optional
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from defaults import BODY_EXCERPT_LENGTH
+from http_client import create_session
 
 logger = logging.getLogger(__name__)
 
+# Dublin Core author element in Zenn RSS items
+DC_CREATOR_TAG = '{http://purl.org/dc/elements/1.1/}creator'
+
+# HTML tags stripped from descriptions, and the article ID at the end of a URL
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_ARTICLE_ID_RE = re.compile(r'/articles/([^/]+)$')
+
+
+def _date_threshold(days_back: int) -> datetime:
+    """
+    Oldest publication time to keep, timezone-aware like RSS pubDate
+
+    Args:
+        days_back: Number of days to look back
+
+    Returns:
+        Aware UTC datetime
+    """
+    return datetime.now(timezone.utc) - timedelta(days=days_back)
+
 
 class ZennFetcher:
     """Fetches articles from Zenn RSS feed"""
@@ -25,6 +50,8 @@ class ZennFetcher:
         """
         self.config = config or {}
         self.rss_url = self.config.get('rss_url', 'https://zenn.dev/feed')
+        # Pooled keep-alive connections shared by all feed requests
+        self.session = create_session()
 
     def fetch_recent_articles(
         self,
@@ -46,21 +73,7 @@ class ZennFetcher:
         logger.info(f"Fetching articles from Zenn (last {days_back} days)")
 
         try:
-            response = requests.get(self.rss_url, timeout=30)
-            response.raise_for_status()
-
-            # Parse RSS XML
-            root = ET.fromstring(response.content)
-
-            articles = []
-            date_threshold = datetime.now() - timedelta(days=days_back)
-
-            # Find all items in RSS feed
-            for item in root.findall('.//item')[:max_articles]:
-                article = self._parse_rss_item(item)
-
-                if article and article['published_at'] >= date_threshold:
-                    articles.append(article)
+            articles = self._fetch_feed(self.rss_url, max_articles, days_back)
 
             logger.info(f"Fetched {len(articles)} articles from Zenn")
             return articles
@@ -72,6 +85,70 @@ class ZennFetcher:
             logger.error(f"Error parsing RSS XML: {e}")
             return []
 
+    def _fetch_feed(self, url: str, max_articles: int, days_back: int) -> List[Dict]:
+        """
+        Download an RSS feed and parse it while it streams in
+
+        Args:
+            url: Feed URL
+            max_articles: Maximum number of items to read
+            days_back: Number of days to look back
+
+        Returns:
+            List of article dictionaries
+        """
+        date_threshold = _date_threshold(days_back)
+
+        with self.session.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            # Let urllib3 undo gzip/deflate transfer encoding for the parser
+            response.raw.decode_content = True
+            try:
+                return self._parse_feed(response.raw, max_articles, date_threshold)
+            except urllib3.exceptions.HTTPError as e:
+                # Read errors on the raw stream bypass requests' wrapping
+                raise requests.exceptions.ConnectionError(e) from e
+
+    def _parse_feed(
+        self,
+        source: BinaryIO,
+        max_articles: int,
+        date_threshold: datetime
+    ) -> List[Dict]:
+        """
+        Incrementally parse RSS items, stopping after max_articles
+
+        Args:
+            source: Binary file-like object with the RSS XML
+            max_articles: Maximum number of items to read
+            date_threshold: Oldest publication date to keep
+
+        Returns:
+            List of article dictionaries
+        """
+        articles = []
+        seen = 0
+        if max_articles <= 0:
+            return articles
+
+        parse_item = self._parse_rss_item
+        append = articles.append
+        for _, elem in ET.iterparse(source, events=('end',)):
+            if elem.tag != 'item':
+                continue
+
+            article = parse_item(elem)
+            if article and article['published_at'] >= date_threshold:
+                append(article)
+
+            # Drop the parsed subtree; only the empty <item> shell remains
+            elem.clear()
+            seen += 1
+            if seen >= max_articles:
+                break
+
+        return articles
+
     def _parse_rss_item(self, item: ET.Element) -> Optional[Dict]:
         """
         Parse RSS item into standardized format
@@ -83,14 +160,24 @@ class ZennFetcher:
             Parsed article dictionary or None
         """
         try:
+            # Collect child elements in one pass; categories become tags
+            children = {}
+            tags = []
+            for child in item:
+                if child.tag == 'category':
+                    if child.text:
+                        tags.append(child.text)
+                else:
+                    children.setdefault(child.tag, child)
+
             # Extract basic fields
-            title_elem = item.find('title')
-            link_elem = item.find('link')
-            pub_date_elem = item.find('pubDate')
-            creator_elem = item.find('{http://purl.org/dc/elements/1.1/}creator')
-            description_elem = item.find('description')
+            title_elem = children.get('title')
+            link_elem = children.get('link')
+            pub_date_elem = children.get('pubDate')
+            creator_elem = children.get(DC_CREATOR_TAG)
+            description_elem = children.get('description')
 
-            if not all([title_elem, link_elem, pub_date_elem]):
+            if title_elem is None or link_elem is None or pub_date_elem is None:
                 return None
 
             title = title_elem.text
@@ -103,7 +190,7 @@ class ZennFetcher:
 
             # Extract article ID from URL
             # URL format: https://zenn.dev/username/articles/article-id
-            article_id_match = re.search(r'/articles/([^/]+)$', url)
+            article_id_match = _ARTICLE_ID_RE.search(url)
             if not article_id_match:
                 logger.warning(f"Could not extract article ID from URL: {url}")
                 return None
@@ -113,15 +200,11 @@ class ZennFetcher:
             # Extract author
             author = creator_elem.text if creator_elem is not None else 'unknown'
 
-            # Extract tags from categories
-            categories = item.findall('category')
-            tags = [cat.text for cat in categories if cat.text]
-
             # Get description/content
             description = description_elem.text if description_elem is not None else ''
 
             # Clean HTML tags from description
-            body = re.sub(r'<[^>]+>', '', description)
+            body = _HTML_TAG_RE.sub('', description)
 
             return {
                 'source': 'zenn',
@@ -137,6 +220,7 @@ class ZennFetcher:
                 'stocks_count': 0,  # Not available in RSS
                 'tags': tags if tags else ['Zenn'],
                 'body': body,
+                'body_excerpt': body[:BODY_EXCERPT_LENGTH],
                 'rendered_body': description,
             }
 
@@ -165,17 +249,7 @@ class ZennFetcher:
         logger.info(f"Fetching articles from Zenn topic: {topic}")
 
         try:
-            response = requests.get(topic_url, timeout=30)
-            response.raise_for_status()
-
-            root = ET.fromstring(response.content)
-            articles = []
-            date_threshold = datetime.now() - timedelta(days=days_back)
-
-            for item in root.findall('.//item')[:max_articles]:
-                article = self._parse_rss_item(item)
-                if article and article['published_at'] >= date_threshold:
-                    articles.append(article)
+            articles = self._fetch_feed(topic_url, max_articles, days_back)
 
             logger.info(f"Fetched {len(articles)} articles from topic '{topic}'")
             return articles
@@ -183,3 +257,37 @@ class ZennFetcher:
         except Exception as e:
             logger.error(f"Error fetching topic '{topic}': {e}")
             return []
+
+    def fetch_many_topics(
+        self,
+        topics: List[str],
+        days_back: int = 7,
+        max_articles: int = 20,
+        max_workers: int = 8
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch several Zenn topic feeds concurrently
+
+        Args:
+            topics: Topic names
+            days_back: Number of days to look back
+            max_articles: Maximum number of articles per topic
+            max_workers: Maximum number of parallel requests
+
+        Returns:
+            Dictionary mapping topic to its articles, in the order given
+        """
+        topics = list(dict.fromkeys(topics))
+        if not topics:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(topics), max_workers)) as pool:
+            futures = {
+                pool.submit(self.fetch_topic_articles, topic, days_back, max_articles): topic
+                for topic in topics
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return {topic: results[topic] for topic in topics}